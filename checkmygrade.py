@@ -1,13 +1,24 @@
 # CheckMyGrade console based Application 
 # DATA 200 Lab 1 Project 
 
+import argparse
 import csv
+import gc
+import json
 import os
+import queue
+import re
+import threading
 import time
-import unittest
+from collections import deque
+from contextlib import contextmanager
+from operator import itemgetter
 from typing import List, Tuple, Optional, Dict, Any
 import hashlib
+import inspect
 import secrets
+import shlex
+import sys
 
 # ============================================================================
 # PART 1: DATA STRUCTURES
@@ -182,11 +193,172 @@ class Student:
 # PART 4: FILE MANAGER
 # ============================================================================
 
+STUDENT_FIELDS = ["Student_id", "First_name", "Last_name", "Email_address", "Course_id", "Grade", "Marks"]
+COURSE_FIELDS = ["Course_id", "Course_name", "Description", "Credits"]
+PROFESSOR_FIELDS = ["Professor_id", "Professor_name", "Email", "Rank", "Course_id"]
+
+_NUMBER = re.compile(r"\s*[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?\s*").fullmatch
+_INTEGER = re.compile(r"\s*[+-]?\d+\s*").fullmatch
+
+
+# The CRUD methods check marks/credits with the same rules as BulkLoader, so anything saved can be loaded back
+def parse_marks(value: Any) -> float:
+    if not _NUMBER(str(value)):
+        raise ValueError("Marks must be a number")
+    return float(value)
+
+
+def parse_credits(value: Any) -> int:
+    if not _INTEGER(str(value)):
+        raise ValueError("Credits must be an integer")
+    return int(value)
+
+
+class RowError:
+    def __init__(self, row: int, field: str, reason: str):
+        self.row = row
+        self.field = field
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"RowError(row={self.row}, field={self.field!r}, reason={self.reason!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"Row": self.row, "Field": self.field, "Reason": self.reason}
+
+
+class LoadReport:
+    def __init__(self, path: str):
+        self.path = path
+        self.records: List[Any] = []
+        self.errors: List[RowError] = []
+        self.rows_read = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def summary(self) -> str:
+        return f"{self.path}: {len(self.records)} loaded, {len(self.errors)} rejected of {self.rows_read} rows"
+
+
+class BulkLoader:
+    """Streams CSV rows through precompiled field checks, collecting bad rows instead of raising per row."""
+
+    # (column, check, reason); checks never raise, so the hot loop has no try/except
+    STUDENT_CHECKS = [
+        ("Student_id", bool, "required"),
+        ("First_name", bool, "required"),
+        ("Email_address", bool, "required"),
+        ("Marks", _NUMBER, "must be a number"),
+    ]
+    COURSE_CHECKS = [
+        ("Course_id", bool, "required"),
+        ("Course_name", bool, "required"),
+        ("Credits", _INTEGER, "must be an integer"),
+    ]
+    PROFESSOR_CHECKS = [
+        ("Professor_id", bool, "required"),
+        ("Professor_name", bool, "required"),
+        ("Email", bool, "required"),
+    ]
+
+    def __init__(self, quarantine_folder: Optional[str] = None):
+        self.quarantine_folder = quarantine_folder
+
+    def load_students(self, path: str) -> LoadReport:
+        def build(r):
+            return Student(r[0], r[1], r[2], r[3], r[4], r[5], float(r[6]))
+        return self._load(path, STUDENT_FIELDS, self.STUDENT_CHECKS, build)
+
+    def load_courses(self, path: str) -> LoadReport:
+        def build(r):
+            return Course(r[0], r[1], r[2], int(r[3]) if len(r) > 3 else 3)
+        return self._load(path, COURSE_FIELDS, self.COURSE_CHECKS, build, optional={"Credits"})
+
+    def load_professors(self, path: str) -> LoadReport:
+        def build(r):
+            return Professor(r[0], r[1], r[2], r[3], r[4])
+        return self._load(path, PROFESSOR_FIELDS, self.PROFESSOR_CHECKS, build)
+
+    def _load(self, path: str, fields: List[str], checks, build, optional=frozenset()) -> LoadReport:
+        report = LoadReport(path)
+        if not os.path.exists(path):
+            return report
+        with open(path, "r", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return report
+            pos = {name: i for i, name in enumerate(header)}
+            missing = [col for col in fields if col not in pos and col not in optional]
+            if missing:
+                report.errors.extend(RowError(1, col, "missing column") for col in missing)
+                return report
+
+            # Absent optional columns are dropped from the tail, so build() sees a shorter row
+            pick = itemgetter(*(pos[col] for col in fields if col in pos))
+            plan = [(pos[col], col, check, reason) for col, check, reason in checks if col in pos]
+            width = len(header)
+            records, errors = report.records, report.errors
+            quarantine = []
+            rowno = 1
+            # Building many objects triggers repeated GC passes that find nothing to free
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                for rowno, row in enumerate(reader, start=2):
+                    if len(row) != width:
+                        if not row:
+                            continue
+                        errors.append(RowError(rowno, "", f"expected {width} columns, got {len(row)}"))
+                        quarantine.append(row)
+                        continue
+                    for i, col, check, reason in plan:
+                        if not check(row[i]):
+                            errors.append(RowError(rowno, col, reason))
+                            quarantine.append(row)
+                            break
+                    else:
+                        records.append(build(pick(row)))
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+            report.rows_read = rowno - 1
+
+        if self.quarantine_folder:
+            if quarantine:
+                self._quarantine(path, header, quarantine, errors)
+            elif os.path.exists(self.quarantine_path(path)):
+                # a clean load supersedes rows rejected on an earlier run
+                os.remove(self.quarantine_path(path))
+        return report
+
+    def quarantine_path(self, path: str) -> str:
+        """Side file for rows rejected from `path`; the source's full path is hashed into the name
+        so same-named files from different folders (e.g. a roster called students.csv) do not collide."""
+        base, ext = os.path.splitext(os.path.basename(path))
+        source = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]
+        return os.path.join(self.quarantine_folder, f"{base}.{source}.rejected{ext}")
+
+    def _quarantine(self, path: str, header: List[str], rows: List[List[str]], errors: List[RowError]):
+        os.makedirs(self.quarantine_folder, exist_ok=True)
+        with open(self.quarantine_path(path), "w", newline="") as f:
+            w = csv.writer(f)
+            # Leading columns stay aligned even when the rejected row itself is ragged
+            w.writerow(["_row", "_error"] + header)
+            for row, err in zip(rows, errors):
+                reason = f"{err.field}: {err.reason}" if err.field else err.reason
+                w.writerow([err.row, reason] + row)
+
+
 class FileManager:
-    def __init__(self, folder: str = "data"):
+    def __init__(self, folder: str = "data", quarantine: bool = False):
         self.folder = folder
         if not os.path.exists(folder):
             os.makedirs(folder)
+        self.loader = BulkLoader(os.path.join(folder, "quarantine") if quarantine else None)
+        self.load_reports: Dict[str, LoadReport] = {}
         self.student_file = os.path.join(folder, "students.csv")
         self.course_file = os.path.join(folder, "courses.csv")
         self.professor_file = os.path.join(folder, "professors.csv")
@@ -200,9 +372,9 @@ class FileManager:
                     w = csv.DictWriter(f, fieldnames=fields)
                     w.writeheader()
 
-        ensure(self.student_file, ["Student_id", "First_name", "Last_name", "Email_address", "Course_id", "Grade", "Marks"])
-        ensure(self.course_file, ["Course_id", "Course_name", "Description", "Credits"])
-        ensure(self.professor_file, ["Professor_id", "Professor_name", "Email", "Rank", "Course_id"])
+        ensure(self.student_file, STUDENT_FIELDS)
+        ensure(self.course_file, COURSE_FIELDS)
+        ensure(self.professor_file, PROFESSOR_FIELDS)
         ensure(self.login_file, ["User_id", "Password", "Role"])
 
     def _read_csv(self, path: str) -> List[Dict[str, Any]]:
@@ -213,7 +385,7 @@ class FileManager:
 
     def _write_csv(self, path: str, rows: List[Dict[str, Any]], fields: List[str]):
         with open(path, "w", newline="") as f:
-            w = csv.DictWriter(f, fieldnames=fields)
+            w = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
             w.writeheader()
             w.writerows(rows)
 
@@ -221,70 +393,89 @@ class FileManager:
     def save_student(self, s: Student):
         rows = [r for r in self._read_csv(self.student_file) if r["Student_id"] != s.student_id]
         rows.append(s.to_dict())
-        self._write_csv(self.student_file, rows, ["Student_id", "First_name", "Last_name", "Email_address", "Course_id", "Grade", "Marks"])
+        self._write_csv(self.student_file, rows, STUDENT_FIELDS)
 
     def delete_new_student(self, student_id: str) -> bool:
         rows = self._read_csv(self.student_file)
         new_rows = [r for r in rows if r["Student_id"] != student_id]
         if len(new_rows) != len(rows):
-            self._write_csv(self.student_file, new_rows, ["Student_id", "First_name", "Last_name", "Email_address", "Course_id", "Grade", "Marks"])
+            self._write_csv(self.student_file, new_rows, STUDENT_FIELDS)
             return True
         return False
 
     def load_students(self) -> List[Student]:
-        out = []
-        for r in self._read_csv(self.student_file):
-            try:
-                out.append(Student(r["Student_id"], r["First_name"], r["Last_name"], r["Email_address"], r["Course_id"], r["Grade"], float(r["Marks"])))
-            except Exception:
-                continue
-        return out
+        report = self.load_reports["students"] = self.loader.load_students(self.student_file)
+        return report.records
 
     # Courses
     def save_course(self, c: Course):
         rows = [r for r in self._read_csv(self.course_file) if r["Course_id"] != c.course_id]
         rows.append(c.to_dict())
-        self._write_csv(self.course_file, rows, ["Course_id", "Course_name", "Description", "Credits"])
+        self._write_csv(self.course_file, rows, COURSE_FIELDS)
 
     def delete_new_course(self, course_id: str) -> bool:
         rows = self._read_csv(self.course_file)
         new_rows = [r for r in rows if r["Course_id"] != course_id]
         if len(new_rows) != len(rows):
-            self._write_csv(self.course_file, new_rows, ["Course_id", "Course_name", "Description", "Credits"])
+            self._write_csv(self.course_file, new_rows, COURSE_FIELDS)
             return True
         return False
 
     def load_courses(self) -> List[Course]:
-        out = []
-        for r in self._read_csv(self.course_file):
-            try:
-                out.append(Course(r["Course_id"], r["Course_name"], r["Description"], int(r.get("Credits", 3))))
-            except Exception:
-                continue
-        return out
+        report = self.load_reports["courses"] = self.loader.load_courses(self.course_file)
+        return report.records
 
     # Professors
     def save_professor(self, p: Professor):
         rows = [r for r in self._read_csv(self.professor_file) if r["Professor_id"] != p.professor_id]
         rows.append(p.to_dict())
-        self._write_csv(self.professor_file, rows, ["Professor_id", "Professor_name", "Email", "Rank", "Course_id"])
+        self._write_csv(self.professor_file, rows, PROFESSOR_FIELDS)
 
     def delete_professor(self, professor_id: str) -> bool:
         rows = self._read_csv(self.professor_file)
         new_rows = [r for r in rows if r["Professor_id"] != professor_id]
         if len(new_rows) != len(rows):
-            self._write_csv(self.professor_file, new_rows, ["Professor_id", "Professor_name", "Email", "Rank", "Course_id"])
+            self._write_csv(self.professor_file, new_rows, PROFESSOR_FIELDS)
             return True
         return False
 
     def load_professors(self) -> List[Professor]:
-        out = []
-        for r in self._read_csv(self.professor_file):
-            try:
-                out.append(Professor(r["Professor_id"], r["Professor_name"], r["Email"], r["Rank"], r["Course_id"]))
-            except Exception:
-                continue
-        return out
+        report = self.load_reports["professors"] = self.loader.load_professors(self.professor_file)
+        return report.records
+
+    def append_rows(self, path: str, rows: List[Dict[str, Any]], fields: List[str]):
+        """Append rows in one write; rows on disk with the same IDs (e.g. ones the loader rejected) are replaced.
+
+        A file whose header differs from `fields` (reordered or extra columns) is rewritten instead,
+        since appended rows are written in `fields` order.
+        """
+        id_field = fields[0]
+        new_ids = {r[id_field] for r in rows}
+        with open(path, "r", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            clash = header != fields or any(r and r[0] in new_ids for r in reader)
+        if clash:
+            kept = [r for r in self._read_csv(path) if r.get(id_field) not in new_ids]
+            self._write_csv(path, kept + rows, fields)
+            return
+        with open(path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\r\n")
+        with open(path, "a", newline="") as f:
+            csv.DictWriter(f, fieldnames=fields).writerows(rows)
+
+    def save_all(self, students: List[Student], courses: List[Course], professors: List[Professor],
+                 entities=("student", "course", "professor")):
+        if "student" in entities:
+            self._write_csv(self.student_file, [s.to_dict() for s in students], STUDENT_FIELDS)
+        if "course" in entities:
+            self._write_csv(self.course_file, [c.to_dict() for c in courses], COURSE_FIELDS)
+        if "professor" in entities:
+            self._write_csv(self.professor_file, [p.to_dict() for p in professors], PROFESSOR_FIELDS)
 
     # Login
     def register_user(self, user_id: str, raw_password: str, role: str = "user"):
@@ -308,36 +499,592 @@ class FileManager:
 # PART 5: MAIN APPLICATION LOGIC
 # ============================================================================
 
+def normalize_course_id(course_id: Any) -> str:
+    # "DATA 201", "data201" and "DATA201" all refer to the same course
+    return "".join(str(course_id or "").split()).upper()
+
+
+class RelationIndex:
+    """Precomputed joins between courses, students and professors, keyed by normalized course ID."""
+
+    def __init__(self):
+        self.students_by_id: Dict[str, Student] = {}
+        self.professors_by_id: Dict[str, Professor] = {}
+        self.courses_by_key: Dict[str, Course] = {}
+        self.course_students: Dict[str, Dict[str, Student]] = {}
+        self.course_professors: Dict[str, Dict[str, Professor]] = {}
+        # course keys referenced by a student/professor but with no matching Course
+        self.dangling: set = set()
+        self._student_key: Dict[str, str] = {}
+        self._professor_key: Dict[str, str] = {}
+
+    def rebuild(self, students: List[Student], courses: List[Course], professors: List[Professor]):
+        self.__init__()
+        for c in courses:
+            self.add_course(c)
+        for s in students:
+            self.add_student(s)
+        for p in professors:
+            self.add_professor(p)
+
+    def _touch(self, key: str):
+        if key and key not in self.courses_by_key and (self.course_students.get(key) or self.course_professors.get(key)):
+            self.dangling.add(key)
+        else:
+            self.dangling.discard(key)
+
+    @staticmethod
+    def _link(buckets: Dict[str, Dict[str, Any]], key: str, obj_id: str, obj: Any):
+        buckets.setdefault(key, {})[obj_id] = obj
+
+    @staticmethod
+    def _unlink(buckets: Dict[str, Dict[str, Any]], key: str, obj_id: str):
+        bucket = buckets.get(key)
+        if bucket is not None:
+            bucket.pop(obj_id, None)
+            if not bucket:
+                del buckets[key]
+
+    # ---- Students
+    def add_student(self, s: Student):
+        if s.student_id in self.students_by_id:
+            self.remove_student(s.student_id)
+        key = normalize_course_id(s.course_id)
+        self.students_by_id[s.student_id] = s
+        self._student_key[s.student_id] = key
+        self._link(self.course_students, key, s.student_id, s)
+        self._touch(key)
+
+    def remove_student(self, student_id: str):
+        if self.students_by_id.pop(student_id, None) is None:
+            return
+        key = self._student_key.pop(student_id)
+        self._unlink(self.course_students, key, student_id)
+        self._touch(key)
+
+    # ---- Professors
+    def add_professor(self, p: Professor):
+        if p.professor_id in self.professors_by_id:
+            self.remove_professor(p.professor_id)
+        key = normalize_course_id(p.course_id)
+        self.professors_by_id[p.professor_id] = p
+        self._professor_key[p.professor_id] = key
+        self._link(self.course_professors, key, p.professor_id, p)
+        self._touch(key)
+
+    def remove_professor(self, professor_id: str):
+        if self.professors_by_id.pop(professor_id, None) is None:
+            return
+        key = self._professor_key.pop(professor_id)
+        self._unlink(self.course_professors, key, professor_id)
+        self._touch(key)
+
+    # ---- Courses
+    def add_course(self, c: Course):
+        key = normalize_course_id(c.course_id)
+        self.courses_by_key[key] = c
+        self._touch(key)
+
+    def remove_course(self, course_id: str):
+        key = normalize_course_id(course_id)
+        self.courses_by_key.pop(key, None)
+        self._touch(key)
+
+    # ---- Queries
+    def get_course(self, course_id: str) -> Optional[Course]:
+        return self.courses_by_key.get(normalize_course_id(course_id))
+
+    def students_in_course(self, course_id: str) -> List[Student]:
+        return list(self.course_students.get(normalize_course_id(course_id), {}).values())
+
+    def professors_for_course(self, course_id: str) -> List[Professor]:
+        return list(self.course_professors.get(normalize_course_id(course_id), {}).values())
+
+    def students_of_professor(self, professor_id: str) -> List[Student]:
+        key = self._professor_key.get(professor_id)
+        if key is None:
+            return []
+        return list(self.course_students.get(key, {}).values())
+
+    def integrity_violations(self) -> List[Tuple[str, str, str]]:
+        out = []
+        for key in sorted(self.dangling):
+            out.extend(("student", s.student_id, s.course_id) for s in self.course_students.get(key, {}).values())
+            out.extend(("professor", p.professor_id, p.course_id) for p in self.course_professors.get(key, {}).values())
+        return out
+
+
+# constructor parameters match attribute names, so cls(**vars(obj)) round-trips
+ENTITY_TYPES = {"student": Student, "course": Course, "professor": Professor}
+
+
+class Mutation:
+    """One change to one record. `before`/`after` hold only the changed fields (None for add/delete)."""
+
+    __slots__ = ("entity", "key", "before", "after", "seq", "ts")
+
+    def __init__(self, entity: str, key: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]],
+                 seq: int = 0, ts: float = 0.0):
+        self.entity = entity
+        self.key = key
+        self.before = before
+        self.after = after
+        self.seq = seq
+        self.ts = ts
+
+    @property
+    def op(self) -> str:
+        if self.before is None:
+            return "add"
+        if self.after is None:
+            return "delete"
+        return "update"
+
+    def inverse(self) -> "Mutation":
+        return Mutation(self.entity, self.key, self.after, self.before)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"seq": self.seq, "ts": self.ts, "entity": self.entity, "key": self.key,
+                "before": self.before, "after": self.after}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Mutation":
+        return cls(d["entity"], d["key"], d["before"], d["after"], d["seq"], d["ts"])
+
+
+class MutationHistory:
+    def __init__(self, limit: int = 1000):
+        # each entry is a group of mutations undone/redone together
+        self.undo_stack: deque = deque(maxlen=limit)
+        self.redo_stack: List[List[Mutation]] = []
+        self._group: Optional[List[Mutation]] = None
+
+    def record(self, m: Mutation):
+        if self._group is not None:
+            self._group.append(m)
+            return
+        self.undo_stack.append([m])
+        self.redo_stack.clear()
+
+    @contextmanager
+    def group(self):
+        if self._group is not None:
+            yield
+            return
+        self._group = []
+        try:
+            yield
+        finally:
+            group, self._group = self._group, None
+            if group:
+                self.undo_stack.append(group)
+                self.redo_stack.clear()
+
+    def pop_undo(self) -> Optional[List[Mutation]]:
+        if not self.undo_stack:
+            return None
+        group = self.undo_stack.pop()
+        self.redo_stack.append(group)
+        return group
+
+    def pop_redo(self) -> Optional[List[Mutation]]:
+        if not self.redo_stack:
+            return None
+        group = self.redo_stack.pop()
+        self.undo_stack.append(group)
+        return group
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+
+def apply_mutation(state: Dict[str, Dict[str, Dict[str, Any]]], m: Mutation):
+    records = state[m.entity]
+    if m.after is None:
+        records.pop(m.key, None)
+    elif m.before is None:
+        records[m.key] = dict(m.after)
+    else:
+        records.setdefault(m.key, {}).update(m.after)
+
+
+class Journal:
+    """On-disk change log split into segments, one per checkpoint, for point-in-time recovery.
+
+    history/checkpoints.csv       Seq,Timestamp,File index of full snapshots
+    history/checkpoint-<seq>.json dataset as of <seq>
+    history/changes-<seq>.jsonl   mutations logged after that checkpoint
+    """
+
+    def __init__(self, folder: str, snapshot, checkpoint_bytes: int = 4_000_000,
+                 checkpoint_interval: float = 3600.0, keep_checkpoints: int = 5):
+        self.folder = folder
+        self.snapshot = snapshot
+        # a checkpoint costs a full snapshot, so take one only once the segment is big or old enough
+        self.checkpoint_bytes = checkpoint_bytes
+        self.checkpoint_interval = checkpoint_interval
+        self.keep_checkpoints = keep_checkpoints
+        self.index_file = os.path.join(folder, "checkpoints.csv")
+        os.makedirs(folder, exist_ok=True)
+        self.checkpoints = self._read_index()
+        self.seq = 0
+        self.segment_bytes = 0
+        if not self.checkpoints:
+            self.checkpoint()
+            return
+        # keep appending to the last segment from the previous run
+        self.base_seq = self.checkpoints[-1][0]
+        self.seq = self.base_seq
+        last = None
+        for last in self._read_segment(self.base_seq):
+            pass
+        if last is not None:
+            self.seq = last.seq
+        path = self._segment_path(self.base_seq)
+        if os.path.exists(path):
+            self.segment_bytes = os.path.getsize(path)
+        # the CSVs may have changed since (hand edits, sessions without a journal); replaying
+        # field-level changes onto records the checkpoint never saw would corrupt restores
+        if self.reconstruct(float("inf")) != self.snapshot():
+            self.rebase()
+
+    def _read_index(self) -> List[Tuple[int, float]]:
+        if not os.path.exists(self.index_file):
+            return []
+        with open(self.index_file, "r", newline="") as f:
+            return [(int(r["Seq"]), float(r["Timestamp"])) for r in csv.DictReader(f)]
+
+    def _checkpoint_path(self, seq: int) -> str:
+        return os.path.join(self.folder, f"checkpoint-{seq:08d}.json")
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.folder, f"changes-{seq:08d}.jsonl")
+
+    def _read_segment(self, seq: int):
+        path = self._segment_path(seq)
+        if not os.path.exists(path):
+            return
+        with open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    yield Mutation.from_dict(json.loads(line))
+
+    def append(self, mutations: List[Mutation]):
+        ts = time.time()
+        for m in mutations:
+            self.seq += 1
+            m.seq, m.ts = self.seq, ts
+        data = "".join(json.dumps(m.to_dict()) + "\n" for m in mutations)
+        with open(self._segment_path(self.base_seq), "a") as f:
+            f.write(data)
+        self.segment_bytes += len(data)
+        if (self.segment_bytes >= self.checkpoint_bytes
+                or ts - self.checkpoints[-1][1] >= self.checkpoint_interval):
+            self.checkpoint()
+
+    def checkpoint(self):
+        ts = time.time()
+        path = self._checkpoint_path(self.seq)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"seq": self.seq, "ts": ts, "state": self.snapshot()}, f)
+        os.replace(tmp, path)
+        new_index = not os.path.exists(self.index_file)
+        with open(self.index_file, "a", newline="") as f:
+            w = csv.writer(f)
+            if new_index:
+                w.writerow(["Seq", "Timestamp", "File"])
+            w.writerow([self.seq, ts, os.path.basename(path)])
+        self.checkpoints.append((self.seq, ts))
+        self.base_seq = self.seq
+        self.segment_bytes = 0
+        if len(self.checkpoints) > self.keep_checkpoints:
+            self._prune()
+
+    def _prune(self):
+        dropped = self.checkpoints[:-self.keep_checkpoints]
+        self.checkpoints = self.checkpoints[-self.keep_checkpoints:]
+        for seq, _ in dropped:
+            for path in (self._checkpoint_path(seq), self._segment_path(seq)):
+                if os.path.exists(path):
+                    os.remove(path)
+        tmp = self.index_file + ".tmp"
+        with open(tmp, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["Seq", "Timestamp", "File"])
+            w.writerows([seq, ts, os.path.basename(self._checkpoint_path(seq))] for seq, ts in self.checkpoints)
+        os.replace(tmp, self.index_file)
+
+    def rebase(self):
+        # a restore is not replayable from the log, so the restored state gets its own checkpoint
+        self.seq += 1
+        self.checkpoint()
+
+    def reconstruct(self, when: float) -> Optional[Dict[str, Dict[str, Dict[str, Any]]]]:
+        # latest checkpoint taken at or before `when`, then replay only its own segment
+        base = None
+        for seq, ts in self.checkpoints:
+            if ts > when:
+                break
+            base = seq
+        if base is None:
+            return None
+        with open(self._checkpoint_path(base), "r") as f:
+            state = json.load(f)["state"]
+        for m in self._read_segment(base):
+            if m.ts > when:
+                break
+            apply_mutation(state, m)
+        return state
+
+
+class ChangeEvent:
+    """Change-data-capture record with full before/after images (None for add/delete)."""
+
+    __slots__ = ("op", "entity", "key", "before", "after", "ts")
+
+    def __init__(self, op: str, entity: str, key: str, before: Optional[Dict[str, Any]],
+                 after: Optional[Dict[str, Any]], ts: float = 0.0):
+        self.op = op
+        self.entity = entity
+        self.key = key
+        self.before = before
+        self.after = after
+        self.ts = ts or time.time()
+
+    def __repr__(self) -> str:
+        return f"ChangeEvent({self.op} {self.entity} {self.key})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"ts": self.ts, "op": self.op, "entity": self.entity, "key": self.key,
+                "before": self.before, "after": self.after}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ChangeEvent":
+        return cls(d["op"], d["entity"], d["key"], d["before"], d["after"], d["ts"])
+
+
+class EventBus:
+    """Delivers change events to subscribers in batches from a background thread.
+
+    publish() only enqueues, so slow subscribers do not hold up writes until
+    max_pending events are waiting; past that, publish() blocks (backpressure).
+    """
+
+    def __init__(self, batch_size: int = 500, max_pending: int = 10000):
+        self.batch_size = batch_size
+        self.subscribers: List[Any] = []
+        self.failures = 0
+        self.last_error: Optional[Exception] = None
+        self._queue: queue.Queue = queue.Queue(max_pending)
+        self._worker: Optional[threading.Thread] = None
+
+    def subscribe(self, handler):
+        """`handler` is called with a list of ChangeEvent objects."""
+        self.subscribers.append(handler)
+        self._start()
+
+    def _start(self):
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="checkmygrade-events", daemon=True)
+            self._worker.start()
+
+    def unsubscribe(self, handler):
+        if handler in self.subscribers:
+            self.subscribers.remove(handler)
+
+    def publish(self, event: ChangeEvent):
+        if self.subscribers:
+            # a publish after close() restarts delivery rather than dropping the event
+            self._start()
+            self._queue.put(event)
+
+    def flush(self):
+        if self._worker is not None:
+            self._queue.join()
+
+    def close(self):
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # under load, drain whatever is already waiting into the same batch
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            events = [e for e in batch if e is not None]
+            if events:
+                self._deliver(events)
+            for _ in batch:
+                self._queue.task_done()
+            if len(events) != len(batch):
+                return
+
+    def _deliver(self, events: List[ChangeEvent]):
+        for handler in list(self.subscribers):
+            try:
+                handler(events)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = e
+
+
+class EventLog:
+    """File-backed change log. Offsets are byte positions, so consumers resume without rescanning."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offsets_file = os.path.splitext(path)[0] + ".offsets.csv"
+        # lines from batches that failed to write; retried ahead of the next batch
+        self.unwritten = b""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    def __call__(self, events: List[ChangeEvent]):
+        data = self.unwritten + "".join(json.dumps(e.to_dict()) + "\n" for e in events).encode()
+        self.unwritten = data
+        with open(self.path, "ab") as f:
+            end = f.tell()
+            try:
+                f.write(data)
+                f.flush()
+            except OSError:
+                # drop any partial line so the retry does not leave a corrupt one behind
+                f.truncate(end)
+                raise
+        self.unwritten = b""
+
+    def read(self, offset: int = 0, max_events: Optional[int] = None) -> Tuple[List[ChangeEvent], int]:
+        out: List[ChangeEvent] = []
+        if not os.path.exists(self.path):
+            return out, offset
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            while max_events is None or len(out) < max_events:
+                line = f.readline()
+                # stop at a partially written trailing line; it is picked up on the next read
+                if not line.endswith(b"\n"):
+                    break
+                out.append(ChangeEvent.from_dict(json.loads(line)))
+                offset += len(line)
+        return out, offset
+
+    def _read_offsets(self) -> Dict[str, int]:
+        if not os.path.exists(self.offsets_file):
+            return {}
+        with open(self.offsets_file, "r", newline="") as f:
+            return {r["Consumer"]: int(r["Offset"]) for r in csv.DictReader(f)}
+
+    def committed(self, consumer: str) -> int:
+        return self._read_offsets().get(consumer, 0)
+
+    def commit(self, consumer: str, offset: int):
+        offsets = self._read_offsets()
+        offsets[consumer] = offset
+        tmp = self.offsets_file + ".tmp"
+        with open(tmp, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["Consumer", "Offset"])
+            w.writerows(offsets.items())
+        os.replace(tmp, self.offsets_file)
+
+    def poll(self, consumer: str, max_events: Optional[int] = None) -> Tuple[List[ChangeEvent], int]:
+        """Events after `consumer`'s committed offset; commit() the returned offset once processed."""
+        return self.read(self.committed(consumer), max_events)
+
+
 class CheckMyGrade:
-    def __init__(self, data_folder: str = "data"):
-        self.fm = FileManager(data_folder)
-        self.students: List[Student] = self.fm.load_students()
-        self.courses: List[Course] = self.fm.load_courses()
-        self.professors: List[Professor] = self.fm.load_professors()
+    def __init__(self, data_folder: str = "data", history_limit: int = 1000, journal: bool = False,
+                 checkpoint_bytes: int = 4_000_000, keep_checkpoints: int = 5, event_log: bool = False,
+                 quarantine: bool = False):
+        self.fm = FileManager(data_folder, quarantine)
+        self.relations = RelationIndex()
+        self._students: List[Student] = self.fm.load_students()
+        self._courses: List[Course] = self.fm.load_courses()
+        self._professors: List[Professor] = self.fm.load_professors()
+        self.relations.rebuild(self._students, self._courses, self._professors)
+        self.history = MutationHistory(history_limit)
+        self._replaying = False
+        # mutations waiting to be journaled together at the end of a batch()
+        self._pending: Optional[List[Mutation]] = None
+        self.journal: Optional[Journal] = None
+        if journal:
+            self.journal = Journal(os.path.join(data_folder, "history"), self.snapshot,
+                                   checkpoint_bytes=checkpoint_bytes, keep_checkpoints=keep_checkpoints)
+        self.events = EventBus()
+        self.event_log: Optional[EventLog] = None
+        if event_log:
+            self.event_log = EventLog(os.path.join(data_folder, "events", "changes.jsonl"))
+            self.events.subscribe(self.event_log)
+
+    # Reassigning a whole list (e.g. reloading from disk) rebuilds the relation index
+    @property
+    def students(self) -> List[Student]:
+        return self._students
+
+    @students.setter
+    def students(self, value: List[Student]):
+        self._students = value
+        self.relations.rebuild(self._students, self._courses, self._professors)
+
+    @property
+    def courses(self) -> List[Course]:
+        return self._courses
+
+    @courses.setter
+    def courses(self, value: List[Course]):
+        self._courses = value
+        self.relations.rebuild(self._students, self._courses, self._professors)
+
+    @property
+    def professors(self) -> List[Professor]:
+        return self._professors
+
+    @professors.setter
+    def professors(self, value: List[Professor]):
+        self._professors = value
+        self.relations.rebuild(self._students, self._courses, self._professors)
 
     # ---- Student operations
     def add_new_student(self, s: Student) -> bool:
-        if any(x.student_id == s.student_id for x in self.students):
+        if s.student_id in self.relations.students_by_id:
             return False
-        self.students.append(s)
+        s.marks = parse_marks(s.marks)
+        self._students.append(s)
+        self.relations.add_student(s)
         self.fm.save_student(s)
+        self._record("student", s.student_id, None, vars(s).copy())
         return True
 
     def update_student_record(self, student_id: str, **kwargs) -> bool:
-        for s in self.students:
-            if s.student_id == student_id:
-                for k, v in kwargs.items():
-                    if hasattr(s, k):
-                        setattr(s, k, v)
-                self.fm.save_student(s)
-                return True
-        return False
+        s = self.relations.students_by_id.get(student_id)
+        if s is None:
+            return False
+        if "marks" in kwargs:
+            kwargs["marks"] = parse_marks(kwargs["marks"])
+        before = {k: getattr(s, k) for k in kwargs if hasattr(s, k)}
+        for k, v in kwargs.items():
+            if hasattr(s, k):
+                setattr(s, k, v)
+        self.relations.add_student(s)
+        self.fm.save_student(s)
+        self._record_update("student", student_id, s, before)
+        return True
 
     def delete_new_student(self, student_id: str) -> bool:
-        before = len(self.students)
-        self.students = [s for s in self.students if s.student_id != student_id]
+        old = self.relations.students_by_id.get(student_id)
+        before = len(self._students)
+        self._students = [s for s in self._students if s.student_id != student_id]
+        self.relations.remove_student(student_id)
         removed = self.fm.delete_new_student(student_id)
-        return removed or len(self.students) < before
+        if old is not None:
+            self._record("student", student_id, vars(old).copy(), None)
+        return removed or len(self._students) < before
 
     def search_student(self, field: str, value: Any) -> Tuple[List[Student], float]:
         start = time.time()
@@ -352,7 +1099,7 @@ class CheckMyGrade:
         return sorted_list, elapsed
 
     def get_student_stats(self, course_id: str) -> Dict[str, float]:
-        marks = [s.marks for s in self.students if s.course_id == course_id]
+        marks = [s.marks for s in self.relations.students_in_course(course_id)]
         if not marks:
             return {}
         marks.sort()
@@ -366,59 +1113,253 @@ class CheckMyGrade:
 
     # ---- Course operations
     def add_new_course(self, c: Course) -> bool:
-        if any(x.course_id == c.course_id for x in self.courses):
+        if self.relations.get_course(c.course_id) is not None:
             return False
-        self.courses.append(c)
+        c.credits = parse_credits(c.credits)
+        self._courses.append(c)
+        self.relations.add_course(c)
         self.fm.save_course(c)
+        self._record("course", c.course_id, None, vars(c).copy())
         return True
 
     def update_course(self, course_id: str, **kwargs) -> bool:
-        for c in self.courses:
-            if c.course_id == course_id:
-                for k, v in kwargs.items():
-                    if hasattr(c, k):
-                        setattr(c, k, v)
-                self.fm.save_course(c)
-                return True
-        return False
+        c = self.relations.get_course(course_id)
+        if c is None:
+            return False
+        if "credits" in kwargs:
+            kwargs["credits"] = parse_credits(kwargs["credits"])
+        before = {k: getattr(c, k) for k in kwargs if hasattr(c, k)}
+        for k, v in kwargs.items():
+            if hasattr(c, k):
+                setattr(c, k, v)
+        self.fm.save_course(c)
+        self._record_update("course", c.course_id, c, before)
+        return True
 
     def delete_new_course(self, course_id: str) -> bool:
-        before = len(self.courses)
-        self.courses = [c for c in self.courses if c.course_id != course_id]
+        c = self.relations.get_course(course_id)
+        if c is not None:
+            course_id = c.course_id
+        before = len(self._courses)
+        self._courses = [x for x in self._courses if x.course_id != course_id]
+        self.relations.remove_course(course_id)
         removed = self.fm.delete_new_course(course_id)
-        return removed or len(self.courses) < before
+        if c is not None:
+            self._record("course", course_id, vars(c).copy(), None)
+        return removed or len(self._courses) < before
 
     # ---- Professor operations
     def add_new_professor(self, p: Professor) -> bool:
-        if any(x.professor_id == p.professor_id for x in self.professors):
+        if p.professor_id in self.relations.professors_by_id:
             return False
-        self.professors.append(p)
+        self._professors.append(p)
+        self.relations.add_professor(p)
         self.fm.save_professor(p)
+        self._record("professor", p.professor_id, None, vars(p).copy())
         return True
 
     def modify_professor_details(self, professor_id: str, **kwargs) -> bool:
-        for p in self.professors:
-            if p.professor_id == professor_id:
-                for k, v in kwargs.items():
-                    if hasattr(p, k):
-                        setattr(p, k, v)
-                self.fm.save_professor(p)
-                return True
-        return False
+        p = self.relations.professors_by_id.get(professor_id)
+        if p is None:
+            return False
+        before = {k: getattr(p, k) for k in kwargs if hasattr(p, k)}
+        for k, v in kwargs.items():
+            if hasattr(p, k):
+                setattr(p, k, v)
+        self.relations.add_professor(p)
+        self.fm.save_professor(p)
+        self._record_update("professor", professor_id, p, before)
+        return True
 
     def delete_professor(self, professor_id: str) -> bool:
-        before = len(self.professors)
-        self.professors = [p for p in self.professors if p.professor_id != professor_id]
+        old = self.relations.professors_by_id.get(professor_id)
+        before = len(self._professors)
+        self._professors = [p for p in self._professors if p.professor_id != professor_id]
+        self.relations.remove_professor(professor_id)
         removed = self.fm.delete_professor(professor_id)
-        return removed or len(self.professors) < before
+        if old is not None:
+            self._record("professor", professor_id, vars(old).copy(), None)
+        return removed or len(self._professors) < before
+
+    # ---- Bulk operations
+    def add_many(self, records: List[Any]) -> Tuple[int, int]:
+        """Add Student/Course/Professor objects as one undo step, appending each file once. Returns (added, skipped)."""
+        added: Dict[type, List[Any]] = {Student: [], Course: [], Professor: []}
+        # validate everything first, so a bad record cannot leave memory ahead of the files
+        for r in records:
+            if isinstance(r, Student):
+                r.marks = parse_marks(r.marks)
+            elif isinstance(r, Course):
+                r.credits = parse_credits(r.credits)
+        with self.batch():
+            for r in records:
+                if isinstance(r, Student):
+                    if r.student_id in self.relations.students_by_id:
+                        continue
+                    self._students.append(r)
+                    self.relations.add_student(r)
+                    self._record("student", r.student_id, None, vars(r).copy())
+                elif isinstance(r, Course):
+                    if self.relations.get_course(r.course_id) is not None:
+                        continue
+                    self._courses.append(r)
+                    self.relations.add_course(r)
+                    self._record("course", r.course_id, None, vars(r).copy())
+                elif isinstance(r, Professor):
+                    if r.professor_id in self.relations.professors_by_id:
+                        continue
+                    self._professors.append(r)
+                    self.relations.add_professor(r)
+                    self._record("professor", r.professor_id, None, vars(r).copy())
+                else:
+                    continue
+                added[type(r)].append(r)
+        for cls, path, fields in (
+            (Student, self.fm.student_file, STUDENT_FIELDS),
+            (Course, self.fm.course_file, COURSE_FIELDS),
+            (Professor, self.fm.professor_file, PROFESSOR_FIELDS),
+        ):
+            if added[cls]:
+                self.fm.append_rows(path, [r.to_dict() for r in added[cls]], fields)
+        count = sum(len(v) for v in added.values())
+        return count, len(records) - count
+
+    # ---- History: undo/redo and point-in-time recovery
+    def _record(self, entity: str, key: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]],
+                current: Optional[Dict[str, Any]] = None):
+        m = Mutation(entity, key, before, after)
+        if not self._replaying:
+            self.history.record(m)
+        if self._pending is not None:
+            self._pending.append(m)
+        elif self.journal:
+            self.journal.append([m])
+        if self.events.subscribers:
+            if current is None:
+                self.events.publish(ChangeEvent(m.op, entity, key, before, after))
+            else:
+                self.events.publish(ChangeEvent("update", entity, key, {**current, **before}, current))
+
+    def _record_update(self, entity: str, key: str, obj: Any, before: Dict[str, Any]):
+        before = {k: v for k, v in before.items() if getattr(obj, k) != v}
+        if before:
+            self._record(entity, key, before, {k: getattr(obj, k) for k in before}, vars(obj).copy())
+
+    def _apply_group(self, mutations: List[Mutation]):
+        """Apply undo/redo mutations in memory, then rewrite each affected file once."""
+        index = self.relations
+        ops = {
+            "student": (index.students_by_id.get, index.add_student, index.remove_student, self._students),
+            "course": (index.get_course, index.add_course, index.remove_course, self._courses),
+            "professor": (index.professors_by_id.get, index.add_professor, index.remove_professor, self._professors),
+        }
+        touched = set()
+        self._replaying = True
+        try:
+            with self.batch():
+                for m in mutations:
+                    lookup, add, remove, records = ops[m.entity]
+                    touched.add(m.entity)
+                    obj = lookup(m.key)
+                    if m.after is None:
+                        if obj is not None:
+                            remove(m.key)
+                            self._record(m.entity, m.key, vars(obj).copy(), None)
+                    elif m.before is None:
+                        obj = ENTITY_TYPES[m.entity](**m.after)
+                        records.append(obj)
+                        add(obj)
+                        self._record(m.entity, m.key, None, vars(obj).copy())
+                    elif obj is not None:
+                        before = {k: getattr(obj, k) for k in m.after}
+                        for k, v in m.after.items():
+                            setattr(obj, k, v)
+                        add(obj)
+                        self._record_update(m.entity, m.key, obj, before)
+                # drop deleted and replaced objects in one pass instead of per mutation; this must
+                # happen before batch() journals, since that may checkpoint via snapshot()
+                self._students = [s for s in self._students if index.students_by_id.get(s.student_id) is s]
+                self._courses = [c for c in self._courses if index.get_course(c.course_id) is c]
+                self._professors = [p for p in self._professors
+                                    if index.professors_by_id.get(p.professor_id) is p]
+        finally:
+            self._replaying = False
+        self.fm.save_all(self._students, self._courses, self._professors, touched)
+
+    @contextmanager
+    def batch(self):
+        """Group several edits (e.g. a mass grade change) into a single undo step and journal write."""
+        outer = self._pending is None
+        if outer:
+            self._pending = []
+        try:
+            with self.history.group():
+                yield
+        finally:
+            if outer:
+                pending, self._pending = self._pending, None
+                if self.journal and pending:
+                    self.journal.append(pending)
+
+    def undo(self) -> bool:
+        group = self.history.pop_undo()
+        if group is None:
+            return False
+        self._apply_group([m.inverse() for m in reversed(group)])
+        return True
+
+    def redo(self) -> bool:
+        group = self.history.pop_redo()
+        if group is None:
+            return False
+        self._apply_group(group)
+        return True
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return {
+            "student": {s.student_id: vars(s).copy() for s in self._students},
+            "course": {c.course_id: vars(c).copy() for c in self._courses},
+            "professor": {p.professor_id: vars(p).copy() for p in self._professors},
+        }
+
+    def _publish_diff(self, old: Dict[str, Dict[str, Dict[str, Any]]], new: Dict[str, Dict[str, Dict[str, Any]]]):
+        for entity in ENTITY_TYPES:
+            before_recs, after_recs = old[entity], new[entity]
+            for key, rec in before_recs.items():
+                if key not in after_recs:
+                    self.events.publish(ChangeEvent("delete", entity, key, rec, None))
+                elif after_recs[key] != rec:
+                    self.events.publish(ChangeEvent("update", entity, key, rec, after_recs[key]))
+            for key, rec in after_recs.items():
+                if key not in before_recs:
+                    self.events.publish(ChangeEvent("add", entity, key, None, rec))
+
+    def restore_to(self, when: float) -> bool:
+        if self.journal is None:
+            return False
+        state = self.journal.reconstruct(when)
+        if state is None:
+            return False
+        # build everything first, so a bad record leaves the app and the event stream untouched
+        students = [Student(**d) for d in state["student"].values()]
+        courses = [Course(**d) for d in state["course"].values()]
+        professors = [Professor(**d) for d in state["professor"].values()]
+        if self.events.subscribers:
+            self._publish_diff(self.snapshot(), state)
+        self._students, self._courses, self._professors = students, courses, professors
+        self.relations.rebuild(self._students, self._courses, self._professors)
+        self.fm.save_all(self._students, self._courses, self._professors)
+        self.history.clear()
+        self.journal.rebase()
+        return True
 
     # ---- Reports
     def generate_student_report(self, student_id: str) -> str:
-        s = next((x for x in self.students if x.student_id == student_id), None)
+        s = self.relations.students_by_id.get(student_id)
         return s.display_records() if s else "Student not found"
 
     def generate_course_report(self, course_id: str) -> str:
-        enrolled = [s for s in self.students if s.course_id == course_id]
+        enrolled = self.relations.students_in_course(course_id)
         stats = self.get_student_stats(course_id)
         rep = f"\n=== Course Report: {course_id} ===\n"
         rep += f"Total Students: {len(enrolled)}\n"
@@ -430,15 +1371,23 @@ class CheckMyGrade:
         return rep
 
     def generate_professor_report(self, professor_id: str) -> str:
-        p = next((x for x in self.professors if x.professor_id == professor_id), None)
+        p = self.relations.professors_by_id.get(professor_id)
         if not p:
             return "Professor not found"
-        students = [s for s in self.students if s.course_id == p.course_id]
+        students = self.relations.students_of_professor(professor_id)
         rep = f"\n=== Professor Report: {p.name} ===\n"
         rep += p.professors_details() + "\n"
+        if self.relations.get_course(p.course_id) is None:
+            rep += f"Warning: course {p.course_id} does not exist\n"
         rep += f"Students in {p.course_id}: {len(students)}\n"
         return rep
 
+    def check_referential_integrity(self) -> List[str]:
+        return [
+            f"{kind.capitalize()} {obj_id} references unknown course {course_id}"
+            for kind, obj_id, course_id in self.relations.integrity_violations()
+        ]
+
 
 # ============================================================================
 # PART 6: MENUS (CLI)
@@ -453,7 +1402,9 @@ def display_menu():
     print("3. Professor Management")
     print("4. Reports")
     print("5. Run Unit Tests")
-    print("6. Exit")
+    print("6. Undo Last Change")
+    print("7. Redo")
+    print("8. Exit")
     print("=" * 60)
 
 
@@ -477,7 +1428,7 @@ def student_menu(app: CheckMyGrade):
                 email = input("Email: ").strip()
                 course = input("Course ID: ").strip()
                 grade = input("Grade (or blank): ").strip() or "N/A"
-                marks = float(input("Marks (0-100): ") or 0)
+                marks = parse_marks(input("Marks (0-100): ") or 0)
                 ok = app.add_new_student(Student(sid, fname, lname, email, course, grade, marks))
                 print("✓ Student added." if ok else "✗ Student ID already exists.")
             except Exception as e:
@@ -504,7 +1455,7 @@ def student_menu(app: CheckMyGrade):
             value = input("New value: ").strip()
             if field == "marks":
                 try:
-                    value = float(value)
+                    value = parse_marks(value)
                 except:
                     print("✗ Marks must be numeric.")
                     continue
@@ -543,7 +1494,7 @@ def course_menu(app: CheckMyGrade):
                 cid = input("Course ID: ").strip()
                 name = input("Course Name: ").strip()
                 desc = input("Description: ").strip()
-                credits = int(input("Credits (default 3): ") or 3)
+                credits = parse_credits(input("Credits (default 3): ") or 3)
                 ok = app.add_new_course(Course(cid, name, desc, credits))
                 print("✓ Course added." if ok else "✗ Course ID already exists.")
             except Exception as e:
@@ -562,7 +1513,7 @@ def course_menu(app: CheckMyGrade):
             value = input("New value: ").strip()
             if field == "credits":
                 try:
-                    value = int(value)
+                    value = parse_credits(value)
                 except:
                     print("✗ Credits must be integer.")
                     continue
@@ -629,7 +1580,8 @@ def reports_menu(app: CheckMyGrade):
         print("1. Student Report")
         print("2. Course Report + Stats")
         print("3. Professor Report")
-        print("4. Back")
+        print("4. Referential Integrity Check")
+        print("5. Back")
         choice = input("Enter choice: ").strip()
 
         if choice == "1":
@@ -645,88 +1597,18 @@ def reports_menu(app: CheckMyGrade):
             print(app.generate_professor_report(pid))
 
         elif choice == "4":
-            return
+            problems = app.check_referential_integrity()
+            if not problems:
+                print("✓ All course references are valid.")
+            for line in problems:
+                print(line)
 
-
-# ============================================================================
-# PART 7: UNIT TESTS
-# ============================================================================
-
-class TestCheckMyGrade(unittest.TestCase):
-    def setUp(self):
-        self.app = CheckMyGrade("test_data")
-        self.app.students = []
-        self.app.courses = []
-        self.app.professors = []
-
-    def test_1(self):
-        s = Student("S001", "John", "Doe", "john@sjsu.edu", "DATA200", "A", 95)
-        self.assertTrue(self.app.add_new_student(s))
-        self.assertEqual(len(self.app.students), 1)
-
-    def test_duplicate_student_id(self):
-        s1 = Student("S001", "A", "B", "a@sjsu.edu", "DATA200", "A", 95)
-        s2 = Student("S001", "C", "D", "c@sjsu.edu", "DATA200", "B", 85)
-        self.app.add_new_student(s1)
-        self.assertFalse(self.app.add_new_student(s2))
-
-    def test_delete_student(self):
-        s = Student("S001", "A", "B", "a@sjsu.edu", "DATA200", "A", 95)
-        self.app.add_new_student(s)
-        self.assertTrue(self.app.delete_new_student("S001"))
-        self.assertEqual(len(self.app.students), 0)
-
-    def test_update_student(self):
-        s = Student("S001", "A", "B", "a@sjsu.edu", "DATA200", "A", 95)
-        self.app.add_new_student(s)
-        self.assertTrue(self.app.update_student_record("S001", marks=98, grade="A+"))
-        self.assertEqual(self.app.students[0].marks, 98)
-
-    def test_search_student(self):
-        s1 = Student("S001", "John", "Doe", "john@sjsu.edu", "DATA200", "A", 95)
-        s2 = Student("S002", "Jane", "Smith", "jane@sjsu.edu", "DATA200", "B", 85)
-        self.app.add_new_student(s1)
-        self.app.add_new_student(s2)
-        results, _ = self.app.search_student("first_name", "John")
-        self.assertEqual(len(results), 1)
-
-    def test_sort_students(self):
-        s1 = Student("S001", "John", "Doe", "john@sjsu.edu", "DATA200", "A", 95)
-        s2 = Student("S002", "Jane", "Smith", "jane@sjsu.edu", "DATA200", "B", 85)
-        s3 = Student("S003", "Bob", "J", "bob@sjsu.edu", "DATA200", "C", 75)
-        self.app.add_new_student(s1)
-        self.app.add_new_student(s2)
-        self.app.add_new_student(s3)
-        sorted_list, elapsed = self.app.sort_students("marks", True)
-        self.assertEqual(sorted_list[0].marks, 95)
-        self.assertGreaterEqual(elapsed, 0)
-
-    def test_course_stats(self):
-        for i in range(5):
-            self.app.add_new_student(Student(f"S{i:03d}", f"Stu{i}", "X", f"s{i}@sjsu.edu", "DATA200", "B", 80 + i * 3))
-        stats = self.app.get_student_stats("DATA200")
-        self.assertTrue(80 <= stats["average"] <= 100)
-
-    def test_course_crud(self):
-        c = Course("DATA200", "Data Science", "Intro", 3)
-        self.assertTrue(self.app.add_new_course(c))
-        self.assertTrue(self.app.update_course("DATA200", course_name="Data Science I"))
-        self.assertTrue(self.app.delete_new_course("DATA200"))
-
-    def test_professor_crud(self):
-        p = Professor("P001", "Dr. Smith", "smith@sjsu.edu", "Senior", "DATA200")
-        self.assertTrue(self.app.add_new_professor(p))
-        self.assertTrue(self.app.modify_professor_details("P001", rank="Principal"))
-        self.assertTrue(self.app.delete_professor("P001"))
-
-    def test_bulk_students(self):
-        for i in range(1000):
-            self.app.add_new_student(Student(f"S{i:04d}", "Stu", f"ID{i}", f"s{i}@sjsu.edu", "DATA200", "B", 80))
-        self.assertEqual(len(self.app.students), 1000)
+        elif choice == "5":
+            return
 
 
 # ============================================================================
-# PART 8: SIMPLE LOGIN (OPTIONAL/BONUS)
+# PART 7: SIMPLE LOGIN (OPTIONAL/BONUS)
 # ============================================================================
 
 def login_flow(fm: FileManager) -> bool:
@@ -752,34 +1634,287 @@ def login_flow(fm: FileManager) -> bool:
     return True
 
 
+# ============================================================================
+# PART 8: HEADLESS COMMANDS
+# ============================================================================
+# python checkmygrade.py students add --file roster.csv
+# python checkmygrade.py reports course --all --format json
+# python checkmygrade.py --script nightly.txt   (one command per line, "-" reads stdin)
+
+ENTITY_GROUPS = {
+    "students": ("student", Student, "load_students", "student_id"),
+    "courses": ("course", Course, "load_courses", "course_id"),
+    "professors": ("professor", Professor, "load_professors", "professor_id"),
+}
+FIELD_TYPES = {"marks": parse_marks, "credits": parse_credits}
+
+
+class CommandError(Exception):
+    pass
+
+
+def _command_parser() -> argparse.ArgumentParser:
+    fmt = argparse.ArgumentParser(add_help=False)
+    fmt.add_argument("--format", choices=["text", "json"], default="text")
+
+    parser = argparse.ArgumentParser(prog="checkmygrade.py", exit_on_error=False)
+    groups = parser.add_subparsers(dest="group", required=True)
+    for group in ENTITY_GROUPS:
+        verbs = groups.add_parser(group).add_subparsers(dest="verb", required=True)
+        verbs.add_parser("list", parents=[fmt])
+        add = verbs.add_parser("add", parents=[fmt], help="add from --file or field=value pairs")
+        add.add_argument("--file")
+        add.add_argument("fields", nargs="*")
+        update = verbs.add_parser("update", parents=[fmt])
+        update.add_argument("id")
+        update.add_argument("fields", nargs="+")
+        verbs.add_parser("delete", parents=[fmt]).add_argument("id")
+        if group == "students":
+            search = verbs.add_parser("search", parents=[fmt])
+            search.add_argument("field")
+            search.add_argument("value")
+            sort = verbs.add_parser("sort", parents=[fmt])
+            sort.add_argument("field")
+            sort.add_argument("--desc", action="store_true")
+
+    reports = groups.add_parser("reports").add_subparsers(dest="verb", required=True)
+    reports.add_parser("student", parents=[fmt]).add_argument("id")
+    for kind in ("course", "professor"):
+        rep = reports.add_parser(kind, parents=[fmt])
+        rep.add_argument("id", nargs="?")
+        rep.add_argument("--all", action="store_true")
+    reports.add_parser("integrity", parents=[fmt])
+    groups.add_parser("undo", parents=[fmt])
+    groups.add_parser("redo", parents=[fmt])
+    return parser
+
+
+def _parse_fields(pairs: List[str], cls: type, id_field: Optional[str] = None) -> Dict[str, Any]:
+    """Parse field=value pairs into constructor fields of `cls`; `id_field` is rejected when given."""
+    allowed = set(inspect.signature(cls).parameters) - {id_field}
+    out = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise CommandError(f"expected field=value, got {pair!r}")
+        if key == id_field:
+            raise CommandError(f"{key} cannot be changed; delete and re-add the record instead")
+        if key not in allowed:
+            raise CommandError(f"unknown field {key!r} (expected one of: {', '.join(sorted(allowed))})")
+        try:
+            out[key] = FIELD_TYPES.get(key, str)(value)
+        except ValueError as e:
+            raise CommandError(str(e))
+    return out
+
+
+def _course_report_data(app: CheckMyGrade, course_id: str) -> Dict[str, Any]:
+    course = app.relations.get_course(course_id)
+    return {
+        "course_id": course_id,
+        "course": course.to_dict() if course else None,
+        "professors": [p.professor_id for p in app.relations.professors_for_course(course_id)],
+        "stats": app.get_student_stats(course_id),
+        "students": [s.to_dict() for s in app.relations.students_in_course(course_id)],
+    }
+
+
+def _professor_report_data(app: CheckMyGrade, professor_id: str) -> Dict[str, Any]:
+    p = app.relations.professors_by_id.get(professor_id)
+    if p is None:
+        raise CommandError(f"professor {professor_id} not found")
+    return {
+        "professor": p.to_dict(),
+        "course_exists": app.relations.get_course(p.course_id) is not None,
+        "student_count": len(app.relations.students_of_professor(professor_id)),
+    }
+
+
+def run_command(app: CheckMyGrade, args: argparse.Namespace) -> Tuple[str, Any]:
+    """Run one parsed command and return (text output, JSON-able data)."""
+    if args.group in ("undo", "redo"):
+        ok = app.undo() if args.group == "undo" else app.redo()
+        return (f"✓ {args.group} done." if ok else f"✗ Nothing to {args.group}."), {"ok": ok}
+
+    if args.group == "reports":
+        if args.verb == "student":
+            s = app.relations.students_by_id.get(args.id)
+            if s is None:
+                raise CommandError(f"student {args.id} not found")
+            return s.display_records(), s.to_dict()
+        if args.verb == "integrity":
+            problems = app.check_referential_integrity()
+            return "\n".join(problems) or "✓ All course references are valid.", problems
+        if args.all:
+            ids = [c.course_id for c in app.courses] if args.verb == "course" else [p.professor_id for p in app.professors]
+        elif args.id:
+            ids = [args.id]
+        else:
+            raise CommandError(f"reports {args.verb} needs an ID or --all")
+        if args.verb == "course":
+            return "\n".join(app.generate_course_report(i) for i in ids), [_course_report_data(app, i) for i in ids]
+        data = [_professor_report_data(app, i) for i in ids]
+        return "\n".join(app.generate_professor_report(i) for i in ids), data
+
+    entity, cls, loader, id_field = ENTITY_GROUPS[args.group]
+    add_one, update, delete = {
+        "student": (app.add_new_student, app.update_student_record, app.delete_new_student),
+        "course": (app.add_new_course, app.update_course, app.delete_new_course),
+        "professor": (app.add_new_professor, app.modify_professor_details, app.delete_professor),
+    }[entity]
+    records = {"student": app.students, "course": app.courses, "professor": app.professors}[entity]
+    show = {"student": Student.display_records, "course": Course.display_courses,
+            "professor": Professor.professors_details}[entity]
+
+    if args.verb == "list":
+        return "\n".join(show(r) for r in records), [r.to_dict() for r in records]
+    if args.verb == "add":
+        if args.file:
+            if not os.path.isfile(args.file):
+                raise CommandError(f"no such file: {args.file}")
+            report = getattr(app.fm.loader, loader)(args.file)
+            added, skipped = app.add_many(report.records)
+            errors = [e.to_dict() for e in report.errors]
+            text = f"✓ Added {added}, skipped {skipped} duplicate(s), rejected {len(errors)} row(s)."
+            text += "".join(f"\n  row {e['Row']}: {e['Field'] or 'row'} {e['Reason']}" for e in errors)
+            return text, {"added": added, "duplicates": skipped, "errors": errors}
+        try:
+            obj = cls(**_parse_fields(args.fields, cls))
+        except TypeError as e:
+            raise CommandError(str(e))
+        ok = add_one(obj)
+        return ("✓ Added." if ok else "✗ ID already exists."), {"ok": ok}
+    if args.verb == "update":
+        ok = update(args.id, **_parse_fields(args.fields, cls, id_field))
+        return ("✓ Updated." if ok else "✗ Not found."), {"ok": ok}
+    if args.verb == "delete":
+        ok = delete(args.id)
+        return ("✓ Deleted." if ok else "✗ Not found."), {"ok": ok}
+    fields = set(inspect.signature(Student).parameters)
+    if args.field not in fields:
+        raise CommandError(f"unknown field {args.field!r} (expected one of: {', '.join(sorted(fields))})")
+    if args.verb == "search":
+        value = FIELD_TYPES.get(args.field, str)(args.value)
+        found, _ = app.search_student(args.field, value)
+        return "\n".join(s.display_records() for s in found), [s.to_dict() for s in found]
+    sorted_list, _ = app.sort_students(args.field, args.desc)
+    return "\n".join(s.display_records() for s in sorted_list), [s.to_dict() for s in sorted_list]
+
+
+def run_cli(argv: List[str]) -> int:
+    opts = argparse.ArgumentParser(prog="checkmygrade.py", add_help=False)
+    opts.add_argument("--data", default="data")
+    opts.add_argument("--script", help="file with one command per line ('-' for stdin)")
+    opts.add_argument("--user", help="log in once; password is read from $CHECKMYGRADE_PASSWORD")
+    opts.add_argument("--no-timings", action="store_true")
+    opts.add_argument("--quarantine", action="store_true", help="copy rejected CSV rows to <data>/quarantine/")
+    g, rest = opts.parse_known_args(argv)
+
+    if g.script:
+        try:
+            f = sys.stdin if g.script == "-" else open(g.script)
+            with f:
+                lines = [ln.strip() for ln in f]
+        except OSError as e:
+            print(f"✗ cannot read script {g.script}: {e.strerror}", file=sys.stderr)
+            return 2
+        commands = [ln for ln in lines if ln and not ln.startswith("#")]
+    elif rest:
+        commands = [shlex.join(rest)]
+    else:
+        _command_parser().print_usage(sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    app = CheckMyGrade(g.data, journal=True, event_log=True, quarantine=g.quarantine)
+    for report in app.fm.load_reports.values():
+        if not report.ok:
+            print(f"⚠ {report.summary()}", file=sys.stderr)
+    if g.user:
+        user = app.fm.load_user(g.user)
+        if not (user and user.login(os.environ.get("CHECKMYGRADE_PASSWORD", ""))):
+            print("✗ Invalid credentials.", file=sys.stderr)
+            return 1
+    if not g.no_timings:
+        print(f"[{(time.perf_counter() - start) * 1000:8.1f} ms] startup", file=sys.stderr)
+
+    parser = _command_parser()
+    failures = 0
+    try:
+        for line in commands:
+            t0 = time.perf_counter()
+            try:
+                args = parser.parse_args(shlex.split(line))
+                text, data = run_command(app, args)
+                print(json.dumps(data, default=str) if args.format == "json" else text)
+            except (argparse.ArgumentError, CommandError, ValueError) as e:
+                failures += 1
+                print(f"✗ {line}: {e}", file=sys.stderr)
+            except SystemExit as e:
+                # argparse exits on --help and on missing subcommands
+                if e.code:
+                    failures += 1
+            if not g.no_timings:
+                print(f"[{(time.perf_counter() - t0) * 1000:8.1f} ms] {line}", file=sys.stderr)
+    finally:
+        undelivered = _close_events(app)
+    return 1 if failures or undelivered else 0
+
+
+def _close_events(app: CheckMyGrade) -> int:
+    """Flush change events and report failed deliveries, which leave gaps for downstream consumers."""
+    app.events.close()
+    if app.events.failures:
+        print(f"✗ change event delivery failed {app.events.failures} time(s): {app.events.last_error}",
+              file=sys.stderr)
+    return app.events.failures
+
+
 # ============================================================================
 # PART 9: MAIN
 # ============================================================================
 
 def main():
-    app = CheckMyGrade()
-    if not login_flow(app.fm):
-        return
-    while True:
-        display_menu()
-        choice = input("Enter choice: ").strip()
-        if choice == "1":
-            student_menu(app)
-        elif choice == "2":
-            course_menu(app)
-        elif choice == "3":
-            professor_menu(app)
-        elif choice == "4":
-            reports_menu(app)
-        elif choice == "5":
-            print("\nRunning unit tests...\n")
-            unittest.main(module=__name__, exit=False, verbosity=2)
-        elif choice == "6":
-            print("Goodbye, see you soon!")
-            break
-        else:
-            print("Invalid choice.")
+    app = CheckMyGrade(journal=True, event_log=True)
+    for report in app.fm.load_reports.values():
+        if not report.ok:
+            print(f"⚠ {report.summary()}")
+    # queued change events must reach subscribers however the session ends (EOF, Ctrl-C, errors)
+    try:
+        if not login_flow(app.fm):
+            return
+        while True:
+            display_menu()
+            choice = input("Enter choice: ").strip()
+            if choice == "1":
+                student_menu(app)
+            elif choice == "2":
+                course_menu(app)
+            elif choice == "3":
+                professor_menu(app)
+            elif choice == "4":
+                reports_menu(app)
+            elif choice == "5":
+                print("\nRunning unit tests...\n")
+                # imported lazily so headless commands do not pay for unittest
+                import unittest
+                import test_checkmygrade
+                unittest.main(module=test_checkmygrade, argv=[sys.argv[0]], exit=False, verbosity=2)
+            elif choice == "6":
+                print("✓ Undone." if app.undo() else "✗ Nothing to undo.")
+            elif choice == "7":
+                print("✓ Redone." if app.redo() else "✗ Nothing to redo.")
+            elif choice == "8":
+                print("Goodbye, see you soon!")
+                break
+            else:
+                print("Invalid choice.")
+    finally:
+        undelivered = _close_events(app)
+    return 1 if undelivered else 0
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+    sys.exit(main())
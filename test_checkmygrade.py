@@ -0,0 +1,681 @@
+# CheckMyGrade unit tests
+# Run with: python -m unittest test_checkmygrade  (or option 5 in the app menu)
+# In parallel: python test_checkmygrade.py --parallel 4
+# CHECKMYGRADE_SKIP_SCALE=1 skips the 100k-record tests; CHECKMYGRADE_TIME_FACTOR scales their budgets.
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from typing import List, Tuple
+
+from checkmygrade import (
+    BulkLoader,
+    CheckMyGrade,
+    Course,
+    EventLog,
+    Professor,
+    STUDENT_FIELDS,
+    Student,
+    normalize_course_id,
+    parse_credits,
+    parse_marks,
+    run_cli,
+)
+
+
+# ============================================================================
+# GENERATED FIXTURES
+# ============================================================================
+
+class Fixtures:
+    """Seeded random generators for students, courses and professors, including awkward values."""
+
+    FIRST = ["John", "Jane", "Poushali", "José", "Zoë", "O'Neil", "Li"]
+    LAST = ["Doe", "Smith", "DP", "van der Berg", "Nguyễn", "Lee-Park", ""]
+    RANKS = ["Professor", "Associate Professor", "Senior Lecturer", "Adjunct"]
+
+    def __init__(self, seed: int = 0, course_count: int = 10):
+        self.rng = random.Random(seed)
+        self.course_ids = [f"DATA{200 + i}" for i in range(course_count)]
+
+    def course_ref(self) -> str:
+        # same course written the ways people actually type it
+        cid = self.rng.choice(self.course_ids)
+        return self.rng.choice([cid, cid.lower(), f"{cid[:4]} {cid[4:]}"])
+
+    def student(self, i: int) -> Student:
+        r = self.rng
+        return Student(f"S{i:06d}", r.choice(self.FIRST), r.choice(self.LAST), f"s{i}@sjsu.edu",
+                       self.course_ref(), r.choice(["A", "B", "C", "N/A"]), round(r.uniform(0, 100), 2))
+
+    def course(self, i: int) -> Course:
+        return Course(self.course_ids[i], f"Course {i}", self.rng.choice(["Intro", 'Has "quotes", commas', ""]),
+                      self.rng.randint(1, 5))
+
+    def professor(self, i: int) -> Professor:
+        return Professor(f"P{i:04d}", f"Dr. {self.rng.choice(self.LAST) or 'X'}", f"p{i}@sjsu.edu",
+                         self.rng.choice(self.RANKS), self.course_ref())
+
+    def students(self, n: int) -> List[Student]:
+        return [self.student(i) for i in range(n)]
+
+    def courses(self) -> List[Course]:
+        return [self.course(i) for i in range(len(self.course_ids))]
+
+    def professors(self, n: int) -> List[Professor]:
+        return [self.professor(i) for i in range(n)]
+
+
+def random_mutations(app: CheckMyGrade, fx: Fixtures, steps: int):
+    rng = fx.rng
+    next_id = 10000
+    for _ in range(steps):
+        op = rng.random()
+        ids = list(app.relations.students_by_id)
+        if op < 0.4 or not ids:
+            app.add_new_student(fx.student(next_id))
+            next_id += 1
+        elif op < 0.7:
+            app.update_student_record(rng.choice(ids), marks=round(rng.uniform(0, 100), 2), course_id=fx.course_ref())
+        elif op < 0.85:
+            app.delete_new_student(rng.choice(ids))
+        elif op < 0.95:
+            course = rng.choice(fx.course_ids)
+            if app.relations.get_course(course):
+                app.delete_new_course(course)
+            else:
+                app.add_new_course(fx.course(fx.course_ids.index(course)))
+        else:
+            pids = list(app.relations.professors_by_id)
+            if pids:
+                app.modify_professor_details(rng.choice(pids), course_id=fx.course_ref())
+
+
+class TestCheckMyGrade(unittest.TestCase):
+    def setUp(self):
+        # every test gets its own data folder, so tests can run in any order or in parallel
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data = tmp.name
+        self.app = CheckMyGrade(self.data)
+
+    def test_1(self):
+        s = Student("S001", "John", "Doe", "john@sjsu.edu", "DATA200", "A", 95)
+        self.assertTrue(self.app.add_new_student(s))
+        self.assertEqual(len(self.app.students), 1)
+
+    def test_duplicate_student_id(self):
+        s1 = Student("S001", "A", "B", "a@sjsu.edu", "DATA200", "A", 95)
+        s2 = Student("S001", "C", "D", "c@sjsu.edu", "DATA200", "B", 85)
+        self.app.add_new_student(s1)
+        self.assertFalse(self.app.add_new_student(s2))
+
+    def test_delete_student(self):
+        s = Student("S001", "A", "B", "a@sjsu.edu", "DATA200", "A", 95)
+        self.app.add_new_student(s)
+        self.assertTrue(self.app.delete_new_student("S001"))
+        self.assertEqual(len(self.app.students), 0)
+
+    def test_update_student(self):
+        s = Student("S001", "A", "B", "a@sjsu.edu", "DATA200", "A", 95)
+        self.app.add_new_student(s)
+        self.assertTrue(self.app.update_student_record("S001", marks=98, grade="A+"))
+        self.assertEqual(self.app.students[0].marks, 98)
+
+    def test_search_student(self):
+        s1 = Student("S001", "John", "Doe", "john@sjsu.edu", "DATA200", "A", 95)
+        s2 = Student("S002", "Jane", "Smith", "jane@sjsu.edu", "DATA200", "B", 85)
+        self.app.add_new_student(s1)
+        self.app.add_new_student(s2)
+        results, _ = self.app.search_student("first_name", "John")
+        self.assertEqual(len(results), 1)
+
+    def test_sort_students(self):
+        s1 = Student("S001", "John", "Doe", "john@sjsu.edu", "DATA200", "A", 95)
+        s2 = Student("S002", "Jane", "Smith", "jane@sjsu.edu", "DATA200", "B", 85)
+        s3 = Student("S003", "Bob", "J", "bob@sjsu.edu", "DATA200", "C", 75)
+        self.app.add_new_student(s1)
+        self.app.add_new_student(s2)
+        self.app.add_new_student(s3)
+        sorted_list, elapsed = self.app.sort_students("marks", True)
+        self.assertEqual(sorted_list[0].marks, 95)
+        self.assertGreaterEqual(elapsed, 0)
+
+    def test_course_stats(self):
+        for i in range(5):
+            self.app.add_new_student(Student(f"S{i:03d}", f"Stu{i}", "X", f"s{i}@sjsu.edu", "DATA200", "B", 80 + i * 3))
+        stats = self.app.get_student_stats("DATA200")
+        self.assertTrue(80 <= stats["average"] <= 100)
+
+    def test_course_crud(self):
+        c = Course("DATA200", "Data Science", "Intro", 3)
+        self.assertTrue(self.app.add_new_course(c))
+        self.assertTrue(self.app.update_course("DATA200", course_name="Data Science I"))
+        self.assertTrue(self.app.delete_new_course("DATA200"))
+
+    def test_professor_crud(self):
+        p = Professor("P001", "Dr. Smith", "smith@sjsu.edu", "Senior", "DATA200")
+        self.assertTrue(self.app.add_new_professor(p))
+        self.assertTrue(self.app.modify_professor_details("P001", rank="Principal"))
+        self.assertTrue(self.app.delete_professor("P001"))
+
+    def test_relations_normalize_course_ids(self):
+        self.app.add_new_course(Course("DATA201", "Data Structures", "Arrays", 3))
+        self.app.add_new_professor(Professor("P001", "Dr. Sam", "sam@prof.com", "Senior", "DATA 201"))
+        self.app.add_new_student(Student("S001", "A", "B", "a@sjsu.edu", "data201", "A", 95))
+        self.assertEqual(len(self.app.relations.students_of_professor("P001")), 1)
+        self.assertIn("Students in DATA 201: 1", self.app.generate_professor_report("P001"))
+        self.assertEqual(self.app.check_referential_integrity(), [])
+
+    def test_relations_maintained_on_mutation(self):
+        self.app.add_new_course(Course("DATA200", "Python", "Intro", 3))
+        self.app.add_new_student(Student("S001", "A", "B", "a@sjsu.edu", "DATA200", "A", 95))
+        self.app.update_student_record("S001", course_id="DATA999")
+        self.assertEqual(self.app.relations.students_in_course("DATA200"), [])
+        self.assertEqual(self.app.check_referential_integrity(), ["Student S001 references unknown course DATA999"])
+        self.app.add_new_course(Course("DATA 999", "Capstone", "Project", 3))
+        self.assertEqual(self.app.check_referential_integrity(), [])
+        self.app.delete_new_course("DATA999")
+        self.assertEqual(len(self.app.check_referential_integrity()), 1)
+        self.app.delete_new_student("S001")
+        self.assertEqual(self.app.check_referential_integrity(), [])
+
+    def test_bulk_loader_reports_bad_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "students.csv")
+            with open(path, "w", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(STUDENT_FIELDS)
+                w.writerow(["S001", "A", "B", "a@sjsu.edu", "DATA200", "A", "95"])
+                w.writerow(["S002", "C", "D", "c@sjsu.edu", "DATA200", "B", "abc"])
+                w.writerow(["", "E", "F", "e@sjsu.edu", "DATA200", "C", "70"])
+                w.writerow(["S004", "G"])
+            loader = BulkLoader(os.path.join(tmp, "q"))
+            report = loader.load_students(path)
+            self.assertEqual([s.student_id for s in report.records], ["S001"])
+            self.assertEqual(
+                [(e.row, e.field) for e in report.errors],
+                [(3, "Marks"), (4, "Student_id"), (5, "")],
+            )
+            with open(loader.quarantine_path(path), newline="") as f:
+                rejected = list(csv.DictReader(f))
+            self.assertEqual([r["_row"] for r in rejected], ["3", "4", "5"])
+            other = os.path.join(tmp, "roster", "students.csv")
+            self.assertNotEqual(loader.quarantine_path(other), loader.quarantine_path(path))
+            with open(path, "w", newline="") as f:
+                csv.writer(f).writerows([STUDENT_FIELDS, ["S001", "A", "B", "a@sjsu.edu", "DATA200", "A", "95"]])
+            self.assertTrue(loader.load_students(path).ok)
+            self.assertEqual(os.listdir(os.path.join(tmp, "q")), [])
+
+    def test_input_parsers_match_loader(self):
+        for bad in ("inf", "nan", "1_0", "", "abc"):
+            with self.assertRaises(ValueError):
+                parse_marks(bad)
+        self.assertRaises(ValueError, parse_credits, "3.5")
+        self.assertEqual(parse_marks(" 95 "), 95.0)
+        self.app.add_new_student(Student("S001", "A", "B", "a@sjsu.edu", "DATA200", "A", parse_marks("1e2")))
+        self.assertEqual(len(CheckMyGrade(self.data).students), 1)
+        self.assertRaises(ValueError, self.app.update_student_record, "S001", marks="abc")
+        self.assertRaises(ValueError, self.app.add_new_course, Course("DATA200", "Python", "Intro", "3.5"))
+        self.assertRaises(ValueError, self.app.add_many,
+                          [Student("S002", "C", "D", "c@sjsu.edu", "DATA200", "B", 85),
+                           Student("S003", "E", "F", "e@sjsu.edu", "DATA200", "B", "x")])
+        self.app.add_new_course(Course("DATA200", "Python", "Intro", "4"))
+        self.assertRaises(ValueError, self.app.update_course, "DATA200", credits="many")
+        reloaded = CheckMyGrade(self.data)
+        self.assertTrue(all(r.ok for r in reloaded.fm.load_reports.values()))
+        self.assertEqual([(s.student_id, s.marks) for s in reloaded.students], [("S001", 100.0)])
+        self.assertEqual(reloaded.courses[0].credits, 4)
+
+    def test_adds_survive_rejected_rows_and_missing_newline(self):
+        with open(self.app.fm.student_file, "a", newline="") as f:
+            f.write("S001,A,B,a@sjsu.edu,DATA200,A,abc")
+        app = CheckMyGrade(self.data)
+        self.assertFalse(app.fm.load_reports["students"].ok)
+        app.add_new_student(Student("S001", "A", "B", "a@sjsu.edu", "DATA200", "A", 95))
+        app.add_many([Student("S002", "C", "D", "c@sjsu.edu", "DATA200", "B", 85)])
+        with open(app.fm.student_file, "a", newline="") as f:
+            f.write("S003,E,F,e@sjsu.edu,DATA200,C,oops")
+        app.add_many([Student("S003", "E", "F", "e@sjsu.edu", "DATA200", "C", 70),
+                      Student("S004", "G", "H", "g@sjsu.edu", "DATA200", "C", 60)])
+        reloaded = CheckMyGrade(self.data)
+        self.assertTrue(reloaded.fm.load_reports["students"].ok)
+        self.assertEqual(sorted(s.student_id for s in reloaded.students), ["S001", "S002", "S003", "S004"])
+
+    def test_add_many_rewrites_reordered_or_extra_columns(self):
+        headers = [["Student_id", "Email_address", "First_name", "Last_name", "Course_id", "Grade", "Marks"],
+                   STUDENT_FIELDS + ["Notes"]]
+        for header in headers:
+            with self.subTest(header=header):
+                with open(self.app.fm.student_file, "w", newline="") as f:
+                    w = csv.DictWriter(f, fieldnames=header)
+                    w.writeheader()
+                    w.writerow(dict(zip(header, header), Student_id="S1", First_name="A", Last_name="B",
+                                    Email_address="a@sjsu.edu", Course_id="DATA200", Grade="A", Marks="95"))
+                app = CheckMyGrade(self.data)
+                app.add_many([Student("S2", "D", "E", "c@sjsu.edu", "DATA200", "B", 85)])
+                reloaded = CheckMyGrade(self.data)
+                self.assertTrue(reloaded.fm.load_reports["students"].ok)
+                s2 = reloaded.relations.students_by_id["S2"]
+                self.assertEqual((s2.first_name, s2.email), ("D", "c@sjsu.edu"))
+                self.assertEqual(reloaded.relations.students_by_id["S1"].email, "a@sjsu.edu")
+
+    def test_bulk_loader_missing_column(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "courses.csv")
+            with open(path, "w", newline="") as f:
+                f.write("Course_id,Course_name,Description\nDATA200,Python,Intro\n")
+            report = BulkLoader().load_courses(path)
+            self.assertEqual(report.records[0].credits, 3)
+            report = BulkLoader().load_professors(path)
+            self.assertEqual(report.records, [])
+            self.assertEqual({e.field for e in report.errors}, {"Professor_id", "Professor_name", "Email", "Rank"})
+
+    def test_undo_redo_batch(self):
+        for i in range(3):
+            self.app.add_new_student(Student(f"S{i:03d}", "A", "B", f"s{i}@sjsu.edu", "DATA200", "B", 80))
+        with self.app.batch():
+            for i in range(3):
+                self.app.update_student_record(f"S{i:03d}", grade="F", marks=0)
+        self.assertTrue(self.app.undo())
+        self.assertEqual([s.marks for s in self.app.students], [80, 80, 80])
+        self.assertTrue(self.app.redo())
+        self.assertEqual([s.grade for s in self.app.students], ["F", "F", "F"])
+        self.app.undo()
+        self.app.delete_new_student("S001")
+        self.assertFalse(self.app.redo())
+        self.assertTrue(self.app.undo())
+        self.assertEqual(self.app.relations.students_by_id["S001"].grade, "B")
+
+    def test_point_in_time_restore(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            app = CheckMyGrade(tmp, journal=True)
+            for i in range(5):
+                app.add_new_student(Student(f"S{i:03d}", "A", "B", f"s{i}@sjsu.edu", "DATA200", "B", 80))
+                if i == 2:
+                    app.journal.checkpoint()
+            time.sleep(0.01)
+            mid = time.time()
+            time.sleep(0.01)
+            app.update_student_record("S000", marks=10)
+            app.delete_new_student("S004")
+            self.assertTrue(app.restore_to(mid))
+            self.assertEqual(len(app.students), 5)
+            self.assertEqual(app.relations.students_by_id["S000"].marks, 80)
+            reopened = CheckMyGrade(tmp, journal=True)
+            self.assertEqual(len(reopened.students), 5)
+            self.assertFalse(reopened.restore_to(0))
+
+    def test_journal_keeps_last_checkpoints(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            app = CheckMyGrade(tmp, journal=True, checkpoint_bytes=1, keep_checkpoints=2)
+            start = time.time()
+            for i in range(5):
+                app.add_new_student(Student(f"S{i:03d}", "A", "B", f"s{i}@sjsu.edu", "DATA200", "B", 80))
+            history = os.path.join(tmp, "history")
+            files = sorted(os.listdir(history))
+            self.assertEqual(len([f for f in files if f.startswith("checkpoint-")]), 2)
+            self.assertFalse(app.restore_to(start))
+            CheckMyGrade(tmp, journal=True)
+            self.assertEqual(sorted(os.listdir(history)), files)
+
+    def test_checkpoint_during_undo_omits_deleted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            app = CheckMyGrade(tmp, journal=True, checkpoint_bytes=1)
+            app.add_new_student(Student("S1", "A", "B", "s1@sjsu.edu", "DATA200", "B", 80))
+            app.add_new_student(Student("S2", "A", "B", "s2@sjsu.edu", "DATA200", "B", 80))
+            self.assertTrue(app.undo())
+            time.sleep(0.01)
+            mid = time.time()
+            time.sleep(0.01)
+            app.update_student_record("S1", marks=10)
+            self.assertTrue(app.restore_to(mid))
+            self.assertEqual([s.student_id for s in app.students], ["S1"])
+            self.assertEqual(app.students[0].marks, 80)
+
+    def test_journal_checkpoints_out_of_band_csv_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            CheckMyGrade(tmp, journal=True).add_new_student(
+                Student("S1", "A", "B", "s1@sjsu.edu", "DATA200", "B", 80))
+            CheckMyGrade(tmp).add_new_student(Student("S9", "C", "D", "s9@sjsu.edu", "DATA200", "B", 70))
+            app = CheckMyGrade(tmp, journal=True)
+            app.update_student_record("S9", marks=10)
+            self.assertTrue(app.restore_to(time.time()))
+            self.assertEqual({s.student_id: s.marks for s in app.students}, {"S1": 80, "S9": 10})
+
+    def test_change_events_to_subscribers(self):
+        received = []
+        self.app.events.subscribe(received.extend)
+        self.app.add_new_student(Student("S001", "A", "B", "a@sjsu.edu", "DATA200", "A", 95))
+        self.app.update_student_record("S001", marks=90)
+        self.app.update_student_record("S001", marks=90)
+        self.app.delete_new_student("S001")
+        self.app.events.flush()
+        self.assertEqual([e.op for e in received], ["add", "update", "delete"])
+        update = received[1]
+        self.assertEqual((update.before["marks"], update.after["marks"]), (95, 90))
+        self.assertEqual(update.after["first_name"], "A")
+        self.app.events.close()
+
+    def test_publish_after_close_still_delivers(self):
+        received = []
+        self.app.events.subscribe(received.extend)
+        self.app.events.close()
+        self.app.add_new_student(Student("S001", "A", "B", "a@sjsu.edu", "DATA200", "A", 95))
+        self.app.events.close()
+        self.assertEqual([e.op for e in received], ["add"])
+
+    def test_menu_session_flushes_events_on_eof(self):
+        script = "3\n1\n1\nS001\nA\nB\na@sjsu.edu\nDATA200\nA\n95\n"
+        app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "checkmygrade.py")
+        subprocess.run([sys.executable, app_path], input=script, text=True, cwd=self.data,
+                       capture_output=True, timeout=60)
+        events, _ = EventLog(os.path.join(self.data, "data", "events", "changes.jsonl")).read()
+        self.assertEqual([(e.op, e.key) for e in events], [("add", "S001")])
+
+    def test_event_log_offsets(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            app = CheckMyGrade(tmp, event_log=True)
+            app.add_new_course(Course("DATA200", "Python", "Intro", 3))
+            app.events.flush()
+            log = app.event_log
+            events, offset = log.poll("lms")
+            self.assertEqual([(e.op, e.key) for e in events], [("add", "DATA200")])
+            log.commit("lms", offset)
+            app.update_course("DATA200", credits=4)
+            app.delete_new_course("DATA200")
+            app.events.flush()
+            events, offset = log.poll("lms", max_events=1)
+            self.assertEqual([e.op for e in events], ["update"])
+            log.commit("lms", offset)
+            self.assertEqual([e.op for e in EventLog(log.path).poll("lms")[0]], ["delete"])
+            app.events.close()
+
+    def test_event_log_write_failures_are_retried_and_reported(self):
+        log_path = os.path.join(self.data, "events", "changes.jsonl")
+        # a directory where the log file should be makes every append fail
+        os.makedirs(log_path)
+        err = io.StringIO()
+        with redirect_stdout(io.StringIO()), redirect_stderr(err):
+            code = run_cli(["--data", self.data, "--no-timings",
+                            "courses", "add", "course_id=DATA200", "course_name=Python", "description=Intro"])
+        self.assertEqual(code, 1)
+        self.assertIn("change event delivery failed", err.getvalue())
+        app = CheckMyGrade(self.data, event_log=True)
+        app.add_new_course(Course("DATA300", "ML", "Intro", 3))
+        app.events.flush()
+        os.rmdir(log_path)
+        app.add_new_course(Course("DATA400", "DB", "Intro", 3))
+        app.events.close()
+        self.assertEqual(app.events.failures, 1)
+        self.assertEqual([e.key for e in app.event_log.read()[0]], ["DATA300", "DATA400"])
+
+    def test_headless_script(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            roster = os.path.join(tmp, "roster.csv")
+            with open(roster, "w", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(STUDENT_FIELDS)
+                w.writerow(["S001", "A", "B", "a@sjsu.edu", "DATA200", "A", "95"])
+                w.writerow(["S002", "C", "D", "c@sjsu.edu", "DATA200", "B", "bad"])
+            script = os.path.join(tmp, "script.txt")
+            with open(script, "w") as f:
+                f.write(f"courses add course_id=DATA200 course_name=Python description=Intro credits=3\n"
+                        f"students add --file {roster} --format json\n"
+                        f"# comment\n"
+                        f"students update S001 marks=oops\n"
+                        f"reports course --all --format json\n")
+            out, err = io.StringIO(), io.StringIO()
+            with redirect_stdout(out), redirect_stderr(err):
+                code = run_cli(["--data", os.path.join(tmp, "data"), "--quarantine", "--script", script])
+            self.assertEqual(code, 1)
+            lines = out.getvalue().splitlines()
+            self.assertEqual(json.loads(lines[1])["added"], 1)
+            self.assertEqual(json.loads(lines[2])[0]["stats"]["count"], 1)
+            self.assertIn("Marks must be a number", err.getvalue())
+            self.assertEqual(err.getvalue().count(" ms] "), 5)
+            self.assertEqual(len(CheckMyGrade(os.path.join(tmp, "data")).students), 1)
+            with open(BulkLoader(os.path.join(tmp, "data", "quarantine")).quarantine_path(roster), newline="") as f:
+                self.assertEqual([r["Student_id"] for r in csv.DictReader(f)], ["S002"])
+
+    def test_headless_bad_commands_do_not_stop_script(self):
+        script = os.path.join(self.data, "script.txt")
+        with open(script, "w") as f:
+            f.write("courses add course_id=DATA200 course_name=Python description=Intro\n"
+                    "courses update DATA200 course_id=DATA300\n"
+                    "courses update DATA200 display_courses=x\n"
+                    "students add --file missing.csv\n"
+                    "students sort to_dict\n"
+                    "students search display_records x\n"
+                    "courses update DATA200 credits=4\n")
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            code = run_cli(["--data", self.data, "--no-timings", "--script", script])
+            missing = run_cli(["--data", self.data, "--script", os.path.join(self.data, "nope.txt")])
+        self.assertEqual((code, missing), (1, 2))
+        self.assertIn("course_id cannot be changed", err.getvalue())
+        self.assertIn("unknown field 'display_courses'", err.getvalue())
+        self.assertIn("no such file", err.getvalue())
+        self.assertIn("unknown field 'to_dict'", err.getvalue())
+        self.assertIn("unknown field 'display_records'", err.getvalue())
+        self.assertIn("cannot read script", err.getvalue())
+        self.assertEqual(CheckMyGrade(self.data).courses[0].credits, 4)
+
+    def test_bulk_students(self):
+        for i in range(1000):
+            self.app.add_new_student(Student(f"S{i:04d}", "Stu", f"ID{i}", f"s{i}@sjsu.edu", "DATA200", "B", 80))
+        self.assertEqual(len(self.app.students), 1000)
+
+
+# ============================================================================
+# PROPERTY TESTS
+# ============================================================================
+
+class TestProperties(unittest.TestCase):
+    SEEDS = range(5)
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data = tmp.name
+
+    def _seeded_app(self, seed: int, folder: str) -> CheckMyGrade:
+        fx = Fixtures(seed)
+        app = CheckMyGrade(os.path.join(self.data, folder))
+        app.add_many(fx.courses()[: 7] + fx.students(60) + fx.professors(8))
+        return app
+
+    def test_relations_match_brute_force_join(self):
+        for seed in self.SEEDS:
+            with self.subTest(seed=seed):
+                app = self._seeded_app(seed, f"rel{seed}")
+                random_mutations(app, Fixtures(seed + 100), 200)
+                known = {normalize_course_id(c.course_id) for c in app.courses}
+                for cid in Fixtures().course_ids:
+                    key = normalize_course_id(cid)
+                    expected = sorted(s.student_id for s in app.students if normalize_course_id(s.course_id) == key)
+                    self.assertEqual(sorted(s.student_id for s in app.relations.students_in_course(cid)), expected)
+                expected_bad = sorted(
+                    [s.student_id for s in app.students if normalize_course_id(s.course_id) not in known]
+                    + [p.professor_id for p in app.professors if normalize_course_id(p.course_id) not in known]
+                )
+                self.assertEqual(sorted(v[1] for v in app.relations.integrity_violations()), expected_bad)
+
+    def test_disk_matches_memory_after_mutations(self):
+        for seed in self.SEEDS:
+            with self.subTest(seed=seed):
+                app = self._seeded_app(seed, f"disk{seed}")
+                random_mutations(app, Fixtures(seed + 200), 150)
+                reloaded = CheckMyGrade(app.fm.folder)
+                self.assertEqual(reloaded.snapshot(), app.snapshot())
+                self.assertTrue(all(r.ok for r in reloaded.fm.load_reports.values()))
+
+    def test_undo_all_then_redo_all(self):
+        for seed in self.SEEDS:
+            with self.subTest(seed=seed):
+                app = self._seeded_app(seed, f"undo{seed}")
+                start = app.snapshot()
+                random_mutations(app, Fixtures(seed + 300), 100)
+                end = app.snapshot()
+                while app.undo():
+                    pass
+                # add_many was one undo step, so undoing everything empties the app
+                self.assertEqual(app.snapshot(), {"student": {}, "course": {}, "professor": {}})
+                app.redo()
+                self.assertEqual(app.snapshot(), start)
+                while app.redo():
+                    pass
+                self.assertEqual(app.snapshot(), end)
+                self.assertEqual(CheckMyGrade(app.fm.folder).snapshot(), end)
+
+    def test_loader_rejects_exactly_the_corrupted_rows(self):
+        for seed in self.SEEDS:
+            with self.subTest(seed=seed):
+                fx = Fixtures(seed)
+                path = os.path.join(self.data, f"students{seed}.csv")
+                corrupted = set()
+                with open(path, "w", newline="") as f:
+                    w = csv.writer(f)
+                    w.writerow(STUDENT_FIELDS)
+                    for i, s in enumerate(fx.students(300)):
+                        row = [str(v) for v in s.to_dict().values()]
+                        if fx.rng.random() < 0.2:
+                            col = fx.rng.choice([0, 1, 3, 6])
+                            row[col] = "" if col != 6 else fx.rng.choice(["", "n/a", "1,5", "--1"])
+                            corrupted.add(i + 2)
+                        w.writerow(row)
+                report = BulkLoader().load_students(path)
+                self.assertEqual({e.row for e in report.errors}, corrupted)
+                self.assertEqual(len(report.records) + len(corrupted), 300)
+
+
+# ============================================================================
+# SCALE TESTS
+# ============================================================================
+
+@unittest.skipIf(os.environ.get("CHECKMYGRADE_SKIP_SCALE"), "CHECKMYGRADE_SKIP_SCALE is set")
+class TestScale(unittest.TestCase):
+    N = 100_000
+    TIME_FACTOR = float(os.environ.get("CHECKMYGRADE_TIME_FACTOR", "1"))
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.fx = Fixtures(42, course_count=200)
+        # same options as the CLI, so journal and event costs count against the budgets
+        cls.app = CheckMyGrade(cls.tmp.name, journal=True, event_log=True)
+        start = time.perf_counter()
+        cls.app.add_many(cls.fx.courses() + cls.fx.students(cls.N) + cls.fx.professors(400))
+        cls.add_many_seconds = time.perf_counter() - start
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.app.events.close()
+        cls.tmp.cleanup()
+
+    def assertWithin(self, seconds: float, budget: float, what: str):
+        self.assertLessEqual(seconds, budget * self.TIME_FACTOR, f"{what} took {seconds:.3f}s, budget {budget}s")
+
+    def timed(self, fn) -> float:
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+
+    def test_bulk_add(self):
+        self.assertEqual(len(self.app.students), self.N)
+        self.assertWithin(self.add_many_seconds, 15.0, "journaled add_many of 100k students")
+
+    def test_reload(self):
+        seconds = self.timed(lambda: CheckMyGrade(self.tmp.name))
+        self.assertWithin(seconds, 3.0, "loading 100k students")
+
+    def test_joined_reports(self):
+        seconds = self.timed(lambda: [self.app.generate_course_report(c.course_id) for c in self.app.courses])
+        self.assertWithin(seconds, 2.0, "course reports for 200 courses")
+        seconds = self.timed(lambda: [self.app.generate_professor_report(p.professor_id) for p in self.app.professors])
+        self.assertWithin(seconds, 0.5, "professor reports for 400 professors")
+        self.assertWithin(self.timed(self.app.check_referential_integrity), 0.1, "integrity check")
+
+    def test_search_and_sort(self):
+        self.assertWithin(self.timed(lambda: self.app.search_student("last_name", "DP")), 0.5, "search")
+        self.assertWithin(self.timed(lambda: self.app.sort_students("marks", True)), 1.0, "sort")
+
+    def test_batched_adds_on_large_file(self):
+        extra = [self.fx.student(self.N + i) for i in range(1000)]
+        self.assertWithin(self.timed(lambda: self.app.add_many(extra)), 2.0, "adding 1000 students at 100k records")
+        self.assertWithin(self.timed(self.app.undo), 2.0, "undoing 1000 adds at 100k records")
+        self.assertEqual(len(self.app.students), self.N)
+
+    def test_undo_redo_bulk_add(self):
+        n = self.N // 5
+        with tempfile.TemporaryDirectory() as tmp:
+            app = CheckMyGrade(tmp, journal=True, event_log=True)
+            fx = Fixtures(7)
+            app.add_many(fx.courses())
+            students = fx.students(n)
+            self.assertWithin(self.timed(lambda: app.add_many(students)), 3.0, "journaled add_many of 20k")
+            self.assertWithin(self.timed(app.undo), 3.0, "undoing add_many of 20k")
+            self.assertEqual(len(app.students), 0)
+            self.assertWithin(self.timed(app.redo), 3.0, "redoing add_many of 20k")
+            self.assertEqual(len(CheckMyGrade(tmp).students), n)
+            app.events.close()
+
+
+# ============================================================================
+# PARALLEL RUNNER
+# ============================================================================
+
+def _run_tests(names: List[str]) -> Tuple[int, List[str], int]:
+    result = unittest.TestResult()
+    unittest.defaultTestLoader.loadTestsFromNames(names).run(result)
+    problems = [f"{test.id()}\n{trace}" for test, trace in result.failures + result.errors]
+    return result.testsRun, problems, len(result.skipped)
+
+
+def _test_names(suite) -> List[str]:
+    names = []
+    for item in suite:
+        names.extend(_test_names(item) if isinstance(item, unittest.TestSuite) else [item.id()])
+    return names
+
+
+def run_parallel(workers: int) -> bool:
+    module = sys.modules[__name__]
+    names = _test_names(unittest.defaultTestLoader.loadTestsFromModule(module))
+    # scale tests measure wall-clock budgets, so they run alone once the pool has finished
+    scale = [n for n in names if n.split(".")[-2] == "TestScale"]
+    chunks = [names[i::workers] for i in range(workers) if names[i::workers]]
+    chunks = [[n for n in c if n not in scale] for c in chunks]
+    chunks = [c for c in chunks if c]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(len(chunks)) as pool:
+        results = list(pool.map(_run_tests, chunks))
+    if scale:
+        results.append(_run_tests(scale))
+    ran = sum(r[0] for r in results)
+    skipped = sum(r[2] for r in results)
+    problems = [p for r in results for p in r[1]]
+    for p in problems:
+        print("=" * 70 + "\n" + p)
+    print(f"Ran {ran} tests ({skipped} skipped) on {len(chunks)} workers in {time.perf_counter() - start:.2f}s")
+    print("FAILED" if problems else "OK")
+    return not problems
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser()
+    cli.add_argument("--parallel", type=int, default=0, metavar="N")
+    opts, rest = cli.parse_known_args()
+    if opts.parallel:
+        sys.exit(0 if run_parallel(opts.parallel) else 1)
+    unittest.main(argv=[sys.argv[0]] + rest)